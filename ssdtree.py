@@ -1,17 +1,22 @@
 import sys
 import os
+import stat
 import weakref
 import logging
+import functools
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 from PySide6.QtWidgets import (
     QApplication, QMainWindow, QTreeWidget, QTreeWidgetItem,
     QHBoxLayout, QVBoxLayout, QWidget, QToolBar, QFileDialog,
     QSizePolicy, QComboBox, QLabel, QProgressBar
 )
-from PySide6.QtGui import QAction, QPainter, QColor
-from PySide6.QtCharts import QChart, QChartView, QPieSeries
+from PySide6.QtGui import QAction, QPainter, QColor, QBrush
+from PySide6.QtCharts import QChart, QChartView, QPieSeries, QPieSlice
 from PySide6.QtCore import (
-    Qt, Signal, QObject, QThread, Slot,
-    QDateTime, QLocale, QTimer, QMutex, QMutexLocker
+    Qt, Signal, QObject, QRunnable, QThreadPool, Slot,
+    QDateTime, QLocale, QTimer
 )
 
 # Настройка логирования
@@ -20,154 +25,239 @@ logging.basicConfig(
     format='[%(asctime)s][%(threadName)s][%(levelname)s] %(message)s'
 )
 
+SCANDIR_SUPPORTS_FD = os.scandir in os.supports_fd and hasattr(os, "O_DIRECTORY")
+
+SIZE_UNITS = ((" B", 1), (" KB", 1024), (" MB", 1024 ** 2), (" GB", 1024 ** 3))
+
+# Тексты интерфейса создаются один раз при импорте, окно хранит ссылку на текущий словарь
+TEXTS = {
+    'ru': {
+        'title': "Дерево папок и диаграммы QtCharts (Оптимизированная версия)",
+        'open_folder': "Открыть папку",
+        'sort_label': "Сортировка:",
+        'sort_modes': ["По имени", "По размеру", "По дате создания", "По типу"],
+        'empty_folder': "Папка пуста или нет доступа",
+        'file_props': "Свойства файла: {}",
+        'size_col': "Размер (КБ)",
+        'name_col': "Имя",
+        'props_path': "Путь",
+        'props_size': "Размер",
+        'props_last_mod': "Последнее изменение",
+        'props_last_acc': "Последний доступ",
+        'props_created': "Время создания",
+        'props_rights': "Права доступа",
+        'props_is_dir': "Является директорией",
+        'props_is_file': "Является файлом",
+        'err_size': "Ошибка при подсчёте размеров: {}",
+        'props_yes': "Да",
+        'props_no': "Нет",
+        'select_folder': "Выберите папку",
+        'other': "Прочее",
+        'cached_chart': "{} (прошлый подсчёт)",
+    },
+    'en': {
+        'title': "Folder Tree & QtCharts Diagrams (Optimized)",
+        'open_folder': "Open Folder",
+        'sort_label': "Sort by:",
+        'sort_modes': ["By Name", "By Size", "By Creation Date", "By Type"],
+        'empty_folder': "Folder is empty or inaccessible",
+        'file_props': "File properties: {}",
+        'size_col': "Size (KB)",
+        'name_col': "Name",
+        'props_path': "Path",
+        'props_size': "Size",
+        'props_last_mod': "Last modified",
+        'props_last_acc': "Last accessed",
+        'props_created': "Created",
+        'props_rights': "Permissions",
+        'props_is_dir': "Is directory",
+        'props_is_file': "Is file",
+        'err_size': "Error calculating sizes: {}",
+        'props_yes': "Yes",
+        'props_no': "No",
+        'select_folder': "Select Folder",
+        'other': "Other",
+        'cached_chart': "{} (previous scan)",
+    }
+}
+
+@functools.lru_cache(maxsize=4096)
 def human_readable_size(size_bytes):
-    if size_bytes >= 1024 ** 3:
-        return f"{size_bytes / (1024 ** 3):.2f} GB"
-    elif size_bytes >= 1024 ** 2:
-        return f"{size_bytes / (1024 ** 2):.2f} MB"
-    elif size_bytes >= 1024:
-        return f"{size_bytes / 1024:.2f} KB"
-    else:
+    # Порядок единицы определяется по числу бит: каждые 10 бит — следующая единица
+    idx = min(max((int(size_bytes).bit_length() - 1) // 10, 0), 3)
+    if idx == 0:
         return f"{size_bytes} B"
-
-class DirectoryLoader(QObject):
-    items_loaded = Signal(object, list)
+    unit, divisor = SIZE_UNITS[idx]
+    return f"{size_bytes / divisor:.2f}{unit}"
+
+# Ограниченный LRU-кэш результатов stat; устаревшие записи перечитываются через os.stat
+class StatCache:
+    def __init__(self, ttl=2.0, capacity=4096):
+        self.ttl = ttl
+        self.capacity = capacity
+        self._entries = OrderedDict()
+
+    def put(self, path, st):
+        self._entries[path] = (time.monotonic(), st)
+        self._entries.move_to_end(path)
+        while len(self._entries) > self.capacity:
+            self._entries.popitem(last=False)
+
+    def get(self, path):
+        cached = self._entries.get(path)
+        if cached is None:
+            return None
+        if time.monotonic() - cached[0] > self.ttl:
+            del self._entries[path]
+            return None
+        self._entries.move_to_end(path)
+        return cached[1]
+
+    def clear(self):
+        self._entries.clear()
+
+class DirectoryLoaderSignals(QObject):
+    items_loaded = Signal(object, object)
     finished = Signal(object)
     error = Signal(str)
 
-    def __init__(self, path, parent_item, max_items=10000, batch_size=100):
+class DirectoryLoader(QRunnable):
+    def __init__(self, path, parent_item, max_items=10000, batch_size=1000, flush_interval=0.05):
         super().__init__()
+        self.signals = DirectoryLoaderSignals()
         self.path = path
         self.parent_item_ref = weakref.ref(parent_item)
         self.max_items = max_items
         self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        # Флаг прерывания пишется из GUI-потока и только читается воркером;
+        # присваивание атрибута атомарно, блокировка не нужна
         self._is_interrupted = False
-        self._mutex = QMutex()
 
-    @Slot()
-    def load_directory(self):
-        logging.debug(f"Start loading directory: {self.path}")
+    def run(self):
+        logging.debug("Start loading directory: %s", self.path)
         try:
-            with QMutexLocker(self._mutex):
-                if self._is_interrupted:
-                    logging.debug("Interrupted before start")
-                    return
+            if self._is_interrupted:
+                logging.debug("Interrupted before start")
+                return
             if not os.path.exists(self.path) or not os.path.isdir(self.path):
-                self.error.emit(f"Path does not exist or is not a directory: {self.path}")
+                self.signals.error.emit(f"Path does not exist or is not a directory: {self.path}")
                 return
             count = 0
             batch = []
+            # Батч отправляется по размеру или по таймеру — что наступит раньше
+            last_emit = time.monotonic()
             with os.scandir(self.path) as entries:
                 for entry in entries:
-                    with QMutexLocker(self._mutex):
-                        if self._is_interrupted:
-                            logging.debug("Interrupted during scan")
-                            return
+                    if self._is_interrupted:
+                        logging.debug("Interrupted during scan")
+                        return
                     if count >= self.max_items:
                         break
                     try:
-                        if entry.is_dir(follow_symlinks=False):
+                        is_dir = entry.is_dir(follow_symlinks=False)
+                        st = entry.stat(follow_symlinks=False)
+                        if is_dir:
                             size = 0
-                            has_children = self._has_children(entry.path)
+                            size_text = ""
                         else:
-                            size = entry.stat(follow_symlinks=False).st_size
-                            has_children = False
-                        ctime = QDateTime.fromSecsSinceEpoch(int(entry.stat(follow_symlinks=False).st_ctime))
-                        batch.append((entry.name, size, entry.is_dir(follow_symlinks=False),
-                                      entry.path, ctime, has_children))
+                            size = st.st_size
+                            size_text = f"{size / 1024:.2f}"
+                        batch.append((entry.name, size, size_text, is_dir,
+                                      entry.path, st.st_ctime, st))
                         count += 1
                     except Exception as e:
-                        logging.warning(f"Exception while scanning {entry.path}: {e}")
+                        logging.warning("Exception while scanning %s: %s", entry.path, e)
                         continue
-                    if len(batch) >= self.batch_size:
-                        parent_item = self.parent_item_ref()
-                        if parent_item is not None:
-                            batch.sort(key=lambda x: (not x[2], x[0].lower()))
-                            self.items_loaded.emit(parent_item, batch.copy())
-                        batch.clear()
+                    if (len(batch) >= self.batch_size
+                            or time.monotonic() - last_emit >= self.flush_interval):
+                        self._emit_batch(batch)
+                        batch = []
+                        last_emit = time.monotonic()
             if batch:
-                parent_item = self.parent_item_ref()
-                if parent_item is not None:
-                    batch.sort(key=lambda x: (not x[2], x[0].lower()))
-                    self.items_loaded.emit(parent_item, batch.copy())
-            with QMutexLocker(self._mutex):
-                if not self._is_interrupted:
-                    parent_item = self.parent_item_ref()
-                    if parent_item is not None:
-                        self.finished.emit(parent_item)
-            logging.debug(f"Finished loading directory: {self.path}")
-        except Exception as e:
-            logging.error(f"Error loading directory {self.path}: {str(e)}")
-            self.error.emit(f"Error loading directory {self.path}: {str(e)}")
-
-    def _has_children(self, path):
-        try:
-            with os.scandir(path) as entries:
-                return any(True for _ in entries)
+                self._emit_batch(batch)
+            self._emit_finished()
+            logging.debug("Finished loading directory: %s", self.path)
         except Exception as e:
-            logging.warning(f"Error checking children for {path}: {e}")
-            return False
+            logging.error("Error loading directory %s: %s", self.path, e)
+            # Папка без доступа тоже считается загруженной, чтобы убрать заглушку
+            self._emit_finished()
+            self.signals.error.emit(f"Error loading directory {self.path}: {str(e)}")
+
+    def _emit_batch(self, batch):
+        parent_item = self.parent_item_ref()
+        if parent_item is not None:
+            # Список передаётся без копии: после отправки загрузчик начинает новый
+            self.signals.items_loaded.emit(parent_item, batch)
+
+    def _emit_finished(self):
+        if self._is_interrupted:
+            return
+        parent_item = self.parent_item_ref()
+        if parent_item is not None:
+            self.signals.finished.emit(parent_item)
 
     def interrupt(self):
-        with QMutexLocker(self._mutex):
-            self._is_interrupted = True
-        logging.debug(f"DirectoryLoader interrupted for {self.path}")
+        self._is_interrupted = True
+        logging.debug("DirectoryLoader interrupted for %s", self.path)
 
 class SortableTreeWidgetItem(QTreeWidgetItem):
     def __init__(self, parent=None):
         super().__init__(parent)
         self._is_loading = False
         self._is_loaded = False
+        self._is_placeholder = False
         self._full_path = None
+        self._name_key = ""
+        self._size_key = 0
+        self._ext_key = ""
+        self._ctime_key = None
+        self._is_dir = True
+
+    def set_sort_keys(self, name, size=0, is_dir=True, ctime=None):
+        self._name_key = name.lower()
+        self._size_key = size
+        self._ctime_key = ctime
+        self._is_dir = is_dir
+        # Расширения интернируются: одинаковые сравниваются по указателю
+        self._ext_key = "" if is_dir else sys.intern(os.path.splitext(name)[1].lower().lstrip('.'))
+
+    def _lt_name(self, other):
+        return self._name_key < other._name_key
+
+    def _lt_size(self, other):
+        if self._size_key == other._size_key:
+            return self._name_key < other._name_key
+        return self._size_key > other._size_key
+
+    def _lt_date(self, other):
+        dt1 = self._ctime_key
+        dt2 = other._ctime_key
+        if dt1 is not None and dt2 is not None:
+            return dt1 < dt2
+        else:
+            return self._name_key < other._name_key
+
+    def _lt_type(self, other):
+        if self._is_dir != other._is_dir:
+            return self._is_dir
+        if self._ext_key == other._ext_key:
+            return self._name_key < other._name_key
+        return self._ext_key < other._ext_key
+
+    # Сравнение для каждого режима выбирается один раз в FileTreeWidget.set_sort_mode,
+    # а не перебором режимов при каждом вызове __lt__
+    _lt_by_mode = {"name": _lt_name, "size": _lt_size, "date": _lt_date, "type": _lt_type}
 
     def __lt__(self, other):
         tree = self.treeWidget()
         if not tree:
             return super().__lt__(other)
         column = tree.sortColumn()
-        sort_mode = getattr(tree, "_sort_mode", "name")
         if column == 0:
-            if sort_mode == "name":
-                return self.text(0).lower() < other.text(0).lower()
-            elif sort_mode == "size":
-                try:
-                    s1 = float(self.text(1)) if self.text(1) else 0.0
-                except ValueError:
-                    s1 = 0.0
-                try:
-                    s2 = float(other.text(1)) if other.text(1) else 0.0
-                except ValueError:
-                    s2 = 0.0
-                if s1 == s2:
-                    return self.text(0).lower() < other.text(0).lower()
-                return s1 > s2
-            elif sort_mode == "date":
-                dt1 = self.data(0, Qt.UserRole)
-                dt2 = other.data(0, Qt.UserRole)
-                if dt1 and dt2:
-                    return dt1 < dt2
-                else:
-                    return self.text(0).lower() < other.text(0).lower()
-            elif sort_mode == "type":
-                is_dir1 = self.text(1) == ""
-                is_dir2 = other.text(1) == ""
-                if is_dir1 != is_dir2:
-                    return is_dir1
-                ext1 = os.path.splitext(self.text(0))[1].lower().lstrip('.') if not is_dir1 else ""
-                ext2 = os.path.splitext(other.text(0))[1].lower().lstrip('.') if not is_dir2 else ""
-                if ext1 == ext2:
-                    return self.text(0).lower() < other.text(0).lower()
-                return ext1 < ext2
+            return getattr(tree, "_sort_lt", SortableTreeWidgetItem._lt_name)(self, other)
         elif column == 1:
-            try:
-                s1 = float(self.text(1)) if self.text(1) else 0.0
-            except ValueError:
-                s1 = 0.0
-            try:
-                s2 = float(other.text(1)) if other.text(1) else 0.0
-            except ValueError:
-                s2 = 0.0
-            return s1 < s2
+            return self._size_key < other._size_key
         return super().__lt__(other)
 
     def set_full_path(self, path):
@@ -188,6 +278,12 @@ class SortableTreeWidgetItem(QTreeWidgetItem):
     def is_loaded(self):
         return self._is_loaded
 
+    def set_placeholder(self, placeholder):
+        self._is_placeholder = placeholder
+
+    def is_placeholder(self):
+        return self._is_placeholder
+
 class FileTreeWidget(QTreeWidget):
     selection_changed = Signal(str)
 
@@ -203,24 +299,40 @@ class FileTreeWidget(QTreeWidget):
         self.setMaximumWidth(600)
         self.setSizePolicy(QSizePolicy.Fixed, QSizePolicy.Expanding)
         self._root_path = None
+        # Результаты stat, полученные при сканировании
+        self._stat_cache = StatCache()
         self._sort_mode = "type"
+        self._sort_lt = SortableTreeWidgetItem._lt_by_mode[self._sort_mode]
         self.setSortingEnabled(True)
         self.sortByColumn(0, Qt.AscendingOrder)
-        self._active_threads = {}
-        self._active_workers = {}
-        self._mutex = QMutex()
+        # Загрузчики папок выполняются в собственном пуле, чтобы раскрытие
+        # папок не ждало в очереди за подсчётом размеров в глобальном пуле
+        self._loader_pool = QThreadPool(self)
+        # Словарь меняется только в GUI-потоке: сигналы загрузчиков приходят
+        # через очередь, поэтому блокировка не нужна
+        self._active_loaders = {}
+        self._pending_path = None
+        self._selection_timer = QTimer(self)
+        self._selection_timer.setSingleShot(True)
+        self._selection_timer.setInterval(150)
+        self._selection_timer.timeout.connect(self._emit_selection)
 
     def set_sort_mode(self, mode):
         self._sort_mode = mode
+        self._sort_lt = SortableTreeWidgetItem._lt_by_mode[mode]
         self.sortByColumn(0, Qt.AscendingOrder)
 
     def populate(self, path):
+        self._selection_timer.stop()
+        self._pending_path = None
         self.clear()
-        self._cleanup_threads()
+        self._cleanup_loaders()
+        self._stat_cache.clear()
         self._root_path = os.path.abspath(path)
         root_item = SortableTreeWidgetItem()
         root_item.setText(0, os.path.basename(path) or path)
         root_item.setText(1, "")
+        root_item.set_sort_keys(root_item.text(0))
         root_item.set_full_path(path)
         self.addTopLevelItem(root_item)
         self._load_directory_async(path, root_item)
@@ -237,90 +349,105 @@ class FileTreeWidget(QTreeWidget):
         self._load_directory_async(path, item)
 
     def _load_directory_async(self, path, parent_item):
-        self._cleanup_thread(id(parent_item))
+        self._cleanup_loader(id(parent_item))
         if parent_item.is_loading():
             return
+        # Остатки прерванной загрузки убираются, чтобы новая не добавила их повторно
+        for i in reversed(range(parent_item.childCount())):
+            child = parent_item.child(i)
+            if isinstance(child, SortableTreeWidgetItem) and not child.is_placeholder():
+                parent_item.removeChild(child)
         parent_item.set_loading(True)
-        thread = QThread(self)
-        worker = DirectoryLoader(path, parent_item)
-        worker.moveToThread(thread)
+        loader = DirectoryLoader(path, parent_item)
         item_id = id(parent_item)
-        with QMutexLocker(self._mutex):
-            self._active_threads[item_id] = thread
-            self._active_workers[item_id] = worker
-        thread.started.connect(worker.load_directory)
-        worker.items_loaded.connect(self.on_items_loaded)
-        worker.finished.connect(self.on_loading_finished)
-        worker.error.connect(self.on_loading_error)
-        worker.finished.connect(lambda: self._cleanup_thread(item_id))
-        thread.finished.connect(thread.deleteLater)
-        thread.start()
-        logging.debug(f"Started DirectoryLoader thread for {path}")
-
-    @Slot(object, list)
+        # Пока идёт загрузка, сортировка выключена; всё дерево сортируется
+        # один раз, когда завершится последняя загрузка
+        self.setSortingEnabled(False)
+        signals = loader.signals
+        connections = [
+            signals.items_loaded.connect(self.on_items_loaded),
+            signals.finished.connect(self.on_loading_finished),
+            signals.error.connect(self.on_loading_error),
+            signals.finished.connect(lambda: self._cleanup_loader(item_id)),
+            signals.error.connect(lambda _: self._cleanup_loader(item_id)),
+        ]
+        self._active_loaders[item_id] = (loader, connections)
+        self._loader_pool.start(loader)
+        logging.debug("Started DirectoryLoader for %s", path)
+
+    @Slot(object, object)
     def on_items_loaded(self, parent_item, items_data):
         if not isinstance(parent_item, SortableTreeWidgetItem):
             return
         if parent_item.treeWidget() is None:
             return
-        for name, size, is_dir, full_path, ctime, has_children in items_data:
-            item = SortableTreeWidgetItem(parent_item)
-            item.setText(0, name)
-            item.set_full_path(full_path)
-            if ctime:
-                item.setData(0, Qt.UserRole, ctime)
-            if is_dir:
-                item.setText(1, "")
-                if has_children:
+        self.setUpdatesEnabled(False)
+        self.blockSignals(True)
+        try:
+            self._remove_placeholders(parent_item)
+            new_items = []
+            for name, size, size_text, is_dir, full_path, ctime, st in items_data:
+                # В батче lstat; для ссылок свойства берутся через os.stat с переходом по ссылке
+                if not stat.S_ISLNK(st.st_mode):
+                    self._stat_cache.put(full_path, st)
+                item = SortableTreeWidgetItem()
+                item.setText(0, name)
+                item.setText(1, size_text)
+                item.set_sort_keys(name, size, is_dir, ctime)
+                item.set_full_path(full_path)
+                if is_dir:
+                    # Заглушка добавляется без проверки содержимого папки;
+                    # если папка окажется пустой, она удаляется после загрузки
                     dummy = SortableTreeWidgetItem(item)
                     dummy.setText(0, "Загрузка...")
                     dummy.setText(1, "")
-            else:
-                size_kb = size / 1024 if size > 0 else 0
-                item.setText(1, f"{size_kb:.2f}" if size_kb > 0 else "0.00")
-        parent_item.sortChildren(0, Qt.AscendingOrder)
+                    dummy.set_placeholder(True)
+                new_items.append(item)
+            parent_item.addChildren(new_items)
+        finally:
+            self.blockSignals(False)
+            self.setUpdatesEnabled(True)
+
+    def _remove_placeholders(self, parent_item):
+        for i in reversed(range(parent_item.childCount())):
+            child = parent_item.child(i)
+            if isinstance(child, SortableTreeWidgetItem) and child.is_placeholder():
+                parent_item.removeChild(child)
 
     @Slot(object)
     def on_loading_finished(self, parent_item):
         if isinstance(parent_item, SortableTreeWidgetItem):
+            self._remove_placeholders(parent_item)
             parent_item.set_loading(False)
             parent_item.set_loaded(True)
-        logging.debug(f"Finished loading for {getattr(parent_item, '_full_path', None)}")
+        logging.debug("Finished loading for %s", getattr(parent_item, '_full_path', None))
 
     @Slot(str)
     def on_loading_error(self, error_msg):
         logging.error(error_msg)
 
-    def _cleanup_thread(self, item_id):
-        with QMutexLocker(self._mutex):
-            thread = self._active_threads.pop(item_id, None)
-            worker = self._active_workers.pop(item_id, None)
-        if worker:
-            worker.interrupt()
-            try:
-                worker.items_loaded.disconnect()
-            except Exception:
-                pass
-            try:
-                worker.finished.disconnect()
-            except Exception:
-                pass
-            try:
-                worker.error.disconnect()
-            except Exception:
-                pass
-            worker.deleteLater()
-        if thread:
-            thread.quit()
-            thread.wait()
-            thread.deleteLater()
-        logging.debug(f"Cleaned up thread and worker for item_id={item_id}")
-
-    def _cleanup_threads(self):
-        with QMutexLocker(self._mutex):
-            item_ids = list(self._active_threads.keys())
-        for item_id in item_ids:
-            self._cleanup_thread(item_id)
+    def _cleanup_loader(self, item_id):
+        active = self._active_loaders.pop(item_id, None)
+        if active:
+            loader, connections = active
+            # Загрузчик не ждём: он увидит флаг и завершится сам в потоке пула
+            loader.interrupt()
+            for connection in connections:
+                QObject.disconnect(connection)
+            # Прерванная папка снова доступна для загрузки при следующем раскрытии
+            parent_item = loader.parent_item_ref()
+            if parent_item is not None and parent_item.is_loading():
+                parent_item.set_loading(False)
+        if not self._active_loaders and not self.isSortingEnabled():
+            self.setSortingEnabled(True)
+        logging.debug("Cleaned up loader for item_id=%s", item_id)
+
+    def _cleanup_loaders(self):
+        for item_id in list(self._active_loaders):
+            self._cleanup_loader(item_id)
+
+    def get_cached_stat(self, path):
+        return self._stat_cache.get(path)
 
     def on_selection_changed(self):
         selected = self.selectedItems()
@@ -329,75 +456,169 @@ class FileTreeWidget(QTreeWidget):
             if isinstance(item, SortableTreeWidgetItem):
                 path = item.get_full_path()
                 if path:
-                    self.selection_changed.emit(path)
+                    self._pending_path = path
+                    self._selection_timer.start()
+
+    def _emit_selection(self):
+        path = self._pending_path
+        self._pending_path = None
+        if path:
+            self.selection_changed.emit(path)
 
     def closeEvent(self, event):
-        self._cleanup_threads()
+        self._selection_timer.stop()
+        self._cleanup_loaders()
+        self._loader_pool.waitForDone()
         super().closeEvent(event)
 
-class FolderSizeWorker(QObject):
+class FolderSizeSignals(QObject):
     finished = Signal(dict)
+    partial = Signal(dict)
     error = Signal(str)
     progress = Signal(int)
 
-    def __init__(self, path):
+class FolderSizeWorker(QRunnable):
+    def __init__(self, path, executor, partial_interval=0.2):
         super().__init__()
+        self.signals = FolderSizeSignals()
         self.path = path
+        self.partial_interval = partial_interval
+        # Пул потоков общий для всех подсчётов и принадлежит MainWindow
+        self._executor = executor
+        # Как и в DirectoryLoader, флаг читается потоками пула без блокировки
         self._is_interrupted = False
-        self._mutex = QMutex()
 
-    @Slot()
-    def process(self):
-        logging.debug(f"Start calculating sizes in: {self.path}")
+    def run(self):
+        logging.debug("Start calculating sizes in: %s", self.path)
         try:
-            data = {}
-            entries = list(os.scandir(self.path))
-            total = len(entries)
-            for idx, entry in enumerate(entries):
-                with QMutexLocker(self._mutex):
-                    if self._is_interrupted:
-                        logging.debug("Interrupted during size calculation")
-                        return
+            self._process_entries()
+        except Exception as e:
+            logging.error("Error in FolderSizeWorker: %s", e)
+            self.signals.error.emit(str(e))
+
+    def _process_entries(self):
+        data = {}
+        total = 0
+        processed = 0
+        # Все подпапки верхнего уровня сканируются пулом одновременно;
+        # каждая задача помечена именем элемента верхнего уровня
+        pending = {}
+        subtotals = {}
+        outstanding = {}
+        with os.scandir(self.path) as entries:
+            for entry in entries:
+                if self._is_interrupted:
+                    for future in pending:
+                        future.cancel()
+                    logging.debug("Interrupted during size calculation")
+                    return
+                total += 1
                 try:
                     if entry.is_dir(follow_symlinks=False):
-                        size = self.get_folder_size(entry.path)
-                    else:
-                        size = entry.stat(follow_symlinks=False).st_size
+                        subtotals[entry.name] = 0
+                        outstanding[entry.name] = 1
+                        pending[self._executor.submit(self._scan_dir, entry.path)] = entry.name
+                        continue
+                    size = entry.stat(follow_symlinks=False).st_size
                     if size > 0:
-                        data[entry.name] = size
-                    self.progress.emit(int((idx+1)/total*100))
+                        data[entry.name] = (size, human_readable_size(size))
                 except Exception as e:
-                    logging.warning(f"Error processing {entry.path}: {e}")
-                    continue
-            self.finished.emit(data)
-            logging.debug(f"Finished calculating sizes in: {self.path}")
-        except Exception as e:
-            logging.error(f"Error in FolderSizeWorker: {e}")
-            self.error.emit(str(e))
-
-    def get_folder_size(self, folder):
-        total = 0
+                    logging.warning("Error processing %s: %s", entry.path, e)
+                processed += 1
+        if total:
+            self.signals.progress.emit(int(processed/total*100))
+        # Частичные результаты отправляются не чаще partial_interval и только
+        # если с прошлой отправки добавились новые папки
+        changed = False
+        last_partial = time.monotonic()
+        while pending:
+            if self._is_interrupted:
+                for future in pending:
+                    future.cancel()
+                logging.debug("Interrupted during size calculation")
+                return
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            # Прерывание могло прийти во время ожидания: результаты задач тогда
+            # неполные, и показывать их нельзя
+            if self._is_interrupted:
+                for future in pending:
+                    future.cancel()
+                logging.debug("Interrupted during size calculation")
+                return
+            for future in done:
+                name = pending.pop(future)
+                size, subdirs = future.result()
+                subtotals[name] += size
+                outstanding[name] += len(subdirs) - 1
+                for subdir in subdirs:
+                    pending[self._executor.submit(self._scan_dir, subdir)] = name
+                if outstanding[name] == 0:
+                    size = subtotals[name]
+                    if size > 0:
+                        data[name] = (size, human_readable_size(size))
+                        changed = True
+                    processed += 1
+                    self.signals.progress.emit(int(processed/total*100))
+            if changed and pending and time.monotonic() - last_partial >= self.partial_interval:
+                self.signals.partial.emit(data.copy())
+                changed = False
+                last_partial = time.monotonic()
+        self.signals.finished.emit(data)
+        logging.debug("Finished calculating sizes in: %s", self.path)
+
+    def _scan_dir(self, path):
+        size = 0
+        subdirs = []
+        if self._is_interrupted:
+            return size, subdirs
+        dir_fd = None
         try:
-            for root, dirs, files in os.walk(folder):
-                with QMutexLocker(self._mutex):
-                    if self._is_interrupted:
-                        return 0
-                for f in files:
+            if SCANDIR_SUPPORTS_FD:
+                # Сканирование по дескриптору: stat() выполняется через fstatat
+                # относительно каталога, без разбора полного пути в ядре
+                dir_fd = os.open(path, os.O_RDONLY | os.O_DIRECTORY)
+            with os.scandir(path if dir_fd is None else dir_fd) as entries:
+                for idx, entry in enumerate(entries):
+                    # В очень больших папках прерывание проверяется и внутри цикла
+                    if idx & 4095 == 4095:
+                        if self._is_interrupted:
+                            return size, []
                     try:
-                        fp = os.path.join(root, f)
-                        total += os.path.getsize(fp)
+                        if entry.is_dir(follow_symlinks=False):
+                            subdirs.append(os.path.join(path, entry.name))
+                        else:
+                            size += entry.stat(follow_symlinks=False).st_size
                     except Exception:
                         pass
         except Exception:
             pass
-        return total
+        finally:
+            if dir_fd is not None:
+                os.close(dir_fd)
+        return size, subdirs
 
     def interrupt(self):
-        with QMutexLocker(self._mutex):
-            self._is_interrupted = True
-        logging.debug(f"FolderSizeWorker interrupted for {self.path}")
+        self._is_interrupted = True
+        logging.debug("FolderSizeWorker interrupted for %s", self.path)
 
 class PieChartWidget(QWidget):
+    colors = [
+        QColor("#e6194b"), QColor("#3cb44b"), QColor("#ffe119"),
+        QColor("#4363d8"), QColor("#f58231"), QColor("#911eb4"),
+        QColor("#46f0f0"), QColor("#f032e6"), QColor("#bcf60c"),
+        QColor("#fabebe"), QColor("#008080"), QColor("#e6beff"),
+        QColor("#9a6324"), QColor("#fffac8"), QColor("#800000"),
+        QColor("#aaffc3"), QColor("#808000"), QColor("#ffd8b1"),
+        QColor("#000075"), QColor("#808080"), QColor("#ff4500"),
+        QColor("#2e8b57"), QColor("#1e90ff"), QColor("#ff69b4"),
+        QColor("#8a2be2"), QColor("#00ced1"), QColor("#ff8c00"),
+        QColor("#7fff00"), QColor("#dc143c"), QColor("#00fa9a"),
+    ]
+    # Палитра общая для всех экземпляров и создаётся один раз при импорте
+    _brushes = [QBrush(color) for color in colors]
+    # Ключ сектора «Прочее»: не совпадает ни с одним именем файла или папки
+    _other_key = object()
+
     def __init__(self, parent=None):
         super().__init__(parent)
         self.series = QPieSeries()
@@ -410,44 +631,86 @@ class PieChartWidget(QWidget):
         layout = QHBoxLayout(self)
         layout.setContentsMargins(0, 0, 0, 0)
         layout.addWidget(self.chart_view)
-        self.colors = [
-            QColor("#e6194b"), QColor("#3cb44b"), QColor("#ffe119"),
-            QColor("#4363d8"), QColor("#f58231"), QColor("#911eb4"),
-            QColor("#46f0f0"), QColor("#f032e6"), QColor("#bcf60c"),
-            QColor("#fabebe"), QColor("#008080"), QColor("#e6beff"),
-            QColor("#9a6324"), QColor("#fffac8"), QColor("#800000"),
-            QColor("#aaffc3"), QColor("#808000"), QColor("#ffd8b1"),
-            QColor("#000075"), QColor("#808080"), QColor("#ff4500"),
-            QColor("#2e8b57"), QColor("#1e90ff"), QColor("#ff69b4"),
-            QColor("#8a2be2"), QColor("#00ced1"), QColor("#ff8c00"),
-            QColor("#7fff00"), QColor("#dc143c"), QColor("#00fa9a"),
-        ]
-
-    def update_data(self, data, folder_name, empty_folder_title):
-        self.series.clear()
+        self.max_slices = 20
+        self.min_slices = 5
+        self.min_slice_percent = 2.0
+        # Секторы текущей серии по ключу (имя или _other_key) в порядке серии —
+        # переиспользуются, пока порядок секторов не меняется
+        self._slices = {}
+        self._slices_series = self.series
+        # Индекс цвета палитры для каждого сектора по тому же ключу
+        self._slice_brushes = {}
+
+    def update_data(self, data, folder_name, empty_folder_title, other_title="Other"):
+        if self._slices_series is not self.series:
+            self._slices = {}
+            self._slices_series = self.series
+            self._slice_brushes = {}
         if not data:
+            self.series.clear()
+            self._slices.clear()
+            self._slice_brushes.clear()
             self.chart.setTitle(empty_folder_title)
             return
         self.chart.setTitle(folder_name)
-        data_sorted = sorted(data.items(), key=lambda x: x[1], reverse=True)
-        total_size = sum(size for _, size in data_sorted)
-        for i, (name, size) in enumerate(data_sorted):
-            slice = self.series.append(name, size)
-            slice.setBrush(self.colors[i % len(self.colors)])
+        # data: имя -> (размер в байтах, размер в читаемом виде)
+        data_sorted = sorted(data.items(), key=lambda x: x[1][0], reverse=True)
+        total_size = sum(size for size, _ in data.values())
+        # Мелкие элементы объединяются в один сектор «Прочее»; первые min_slices
+        # показываются всегда, чтобы папка из равных мелких файлов не стала одним сектором
+        min_size = total_size * self.min_slice_percent / 100
+        visible_count = 0
+        for _, (size, _) in data_sorted[:self.max_slices]:
+            if size < min_size and visible_count >= self.min_slices:
+                break
+            visible_count += 1
+        other_size = sum(size for _, (size, _) in data_sorted[visible_count:])
+        entries = [(name, name, size, size_text)
+                   for name, (size, size_text) in data_sorted[:visible_count]]
+        if other_size > 0:
+            entries.append((self._other_key, other_title, other_size,
+                            human_readable_size(other_size)))
+        keys = [key for key, _, _, _ in entries]
+        keys_set = set(keys)
+        for key in [key for key in self._slices if key not in keys_set]:
+            self.series.remove(self._slices.pop(key))
+            del self._slice_brushes[key]
+        if list(self._slices) != keys:
+            # Порядок секторов изменился: существующие секторы вынимаются из серии
+            # без удаления и вставляются заново по убыванию размера, «Прочее» — последним
+            for slice in self._slices.values():
+                self.series.take(slice)
+            slices = {}
+            for key, name, size, _ in entries:
+                slice = self._slices.get(key)
+                if slice is None:
+                    slice = QPieSlice(name, size)
+                    # Цвет закрепляется за сектором при создании и не меняется при перестановке;
+                    # берётся первый цвет палитры, не занятый секторами на экране
+                    used = set(self._slice_brushes.values())
+                    brush_idx = next((idx for idx in range(len(self._brushes)) if idx not in used),
+                                     len(used) % len(self._brushes))
+                    slice.setBrush(self._brushes[brush_idx])
+                    self._slice_brushes[key] = brush_idx
+                self.series.append(slice)
+                slices[key] = slice
+            self._slices = slices
+        legend_labels = []
+        for key, name, size, size_text in entries:
+            slice = self._slices[key]
+            slice.setValue(size)
             percent = size / total_size * 100
             if percent > 1.4:
                 slice.setLabelVisible(True)
                 slice.setLabel(f"{name}\n{percent:.1f}%")
             else:
                 slice.setLabelVisible(False)
+            legend_labels.append(f"{name} — {size_text}")
         legend = self.chart.legend()
-        for marker in legend.markers():
-            label = marker.label()
-            name = label.split('\n')[0]
-            size_bytes = data.get(name, 0)
-            label_text = f"{name} — {human_readable_size(size_bytes)}"
-            marker.setLabel(label_text)
-        self.chart.legend().setVisible(True)
+        # Маркеры легенды идут в порядке секторов, который совпадает с порядком entries
+        for marker, label in zip(legend.markers(self.series), legend_labels):
+            marker.setLabel(label)
+        legend.setVisible(True)
 
     def clear_chart(self):
         if self.series is not None:
@@ -458,6 +721,9 @@ class PieChartWidget(QWidget):
             else:
                 self.series.deleteLater()
             self.series = None
+        self._slices = {}
+        self._slices_series = None
+        self._slice_brushes = {}
         self.chart.setTitle("")
 
 class InfoOverlay(QWidget):
@@ -492,54 +758,9 @@ class MainWindow(QMainWindow):
         # --- Локализация ---
         self.languages = ['ru', 'en']
         self.lang = 'ru'
-        self.texts = {
-            'ru': {
-                'title': "Дерево папок и диаграммы QtCharts (Оптимизированная версия)",
-                'open_folder': "Открыть папку",
-                'sort_label': "Сортировка:",
-                'sort_modes': ["По имени", "По размеру", "По дате создания", "По типу"],
-                'empty_folder': "Папка пуста или нет доступа",
-                'file_props': "Свойства файла: {}",
-                'size_col': "Размер (КБ)",
-                'name_col': "Имя",
-                'props_path': "Путь",
-                'props_size': "Размер",
-                'props_last_mod': "Последнее изменение",
-                'props_last_acc': "Последний доступ",
-                'props_created': "Время создания",
-                'props_rights': "Права доступа",
-                'props_is_dir': "Является директорией",
-                'props_is_file': "Является файлом",
-                'err_size': "Ошибка при подсчёте размеров: {}",
-                'props_yes': "Да",
-                'props_no': "Нет",
-                'select_folder': "Выберите папку",
-            },
-            'en': {
-                'title': "Folder Tree & QtCharts Diagrams (Optimized)",
-                'open_folder': "Open Folder",
-                'sort_label': "Sort by:",
-                'sort_modes': ["By Name", "By Size", "By Creation Date", "By Type"],
-                'empty_folder': "Folder is empty or inaccessible",
-                'file_props': "File properties: {}",
-                'size_col': "Size (KB)",
-                'name_col': "Name",
-                'props_path': "Path",
-                'props_size': "Size",
-                'props_last_mod': "Last modified",
-                'props_last_acc': "Last accessed",
-                'props_created': "Created",
-                'props_rights': "Permissions",
-                'props_is_dir': "Is directory",
-                'props_is_file': "Is file",
-                'err_size': "Error calculating sizes: {}",
-                'props_yes': "Yes",
-                'props_no': "No",
-                'select_folder': "Select Folder",
-            }
-        }
-
-        self.setWindowTitle(self.texts[self.lang]['title'])
+        self.t = TEXTS[self.lang]
+
+        self.setWindowTitle(self.t['title'])
         self.resize(1000, 600)
         central = QWidget()
         self.setCentralWidget(central)
@@ -556,10 +777,10 @@ class MainWindow(QMainWindow):
         self.combo_lang.currentIndexChanged.connect(self.switch_language)
         left_layout.addWidget(self.combo_lang)
 
-        self.label_sort = QLabel(self.texts[self.lang]['sort_label'])
+        self.label_sort = QLabel(self.t['sort_label'])
         left_layout.addWidget(self.label_sort)
         self.sort_combo = QComboBox()
-        self.sort_combo.addItems(self.texts[self.lang]['sort_modes'])
+        self.sort_combo.addItems(self.t['sort_modes'])
         self.sort_combo.currentIndexChanged.connect(self.on_sort_mode_changed)
         left_layout.addWidget(self.sort_combo)
         self.tree = FileTreeWidget(self)
@@ -573,12 +794,19 @@ class MainWindow(QMainWindow):
         main_layout.addWidget(self.chart_widget, stretch=1)
         toolbar = QToolBar()
         self.addToolBar(toolbar)
-        self.open_action = QAction(self.texts[self.lang]['open_folder'], self)
+        self.open_action = QAction(self.t['open_folder'], self)
         self.open_action.triggered.connect(self.open_folder)
         toolbar.addAction(self.open_action)
         self.tree.selection_changed.connect(self.on_tree_selection_changed)
         self.worker = None
-        self.thread = None
+        self.thread_pool = QThreadPool.globalInstance()
+        # Потоки для обхода подпапок создаются один раз и переиспользуются
+        # всеми подсчётами размеров
+        self._size_executor = ThreadPoolExecutor(max_workers=8)
+        # Последние результаты по папкам: путь -> данные диаграммы. Показываются
+        # только как предварительная диаграмма, пока не придут данные нового подсчёта
+        self._result_cache = OrderedDict()
+        self._result_cache_limit = 64
         self.current_worker_id = 0
         self.showing_file_info = False
         self.info_overlay = None
@@ -587,10 +815,11 @@ class MainWindow(QMainWindow):
 
     def switch_language(self, idx):
         self.lang = self.languages[idx]
+        self.t = TEXTS[self.lang]
         self.update_ui_texts()
 
     def update_ui_texts(self):
-        t = self.texts[self.lang]
+        t = self.t
         self.setWindowTitle(t['title'])
         self.open_action.setText(t['open_folder'])
         self.label_sort.setText(t['sort_label'])
@@ -611,10 +840,11 @@ class MainWindow(QMainWindow):
         self.tree.set_sort_mode(mode)
 
     def open_folder(self):
-        t = self.texts[self.lang]
+        t = self.t
         folder = QFileDialog.getExistingDirectory(self, t['select_folder'])
         if folder:
             self._cancel_previous_operations()
+            self._result_cache.clear()
             self.progress_bar.setVisible(True)
             self.progress_bar.setRange(0, 0)
             self.tree.populate(folder)
@@ -625,49 +855,61 @@ class MainWindow(QMainWindow):
             QTimer.singleShot(1000, lambda: self.progress_bar.setVisible(False))
 
     def _cancel_previous_operations(self):
-        if self.worker and self.thread:
+        self._cancel_size_worker()
+        self.tree._cleanup_loaders()
+
+    def _cancel_size_worker(self):
+        if self.worker:
+            # Не блокируем GUI: прерванный воркер сам освободит поток пула
             self.worker.interrupt()
-            self.thread.quit()
-            self.thread.wait(1000)
             self.worker = None
-            self.thread = None
-        self.tree._cleanup_threads()
 
     def on_tree_selection_changed(self, path):
-        if os.path.isdir(path):
+        st = self.tree.get_cached_stat(path)
+        is_dir = stat.S_ISDIR(st.st_mode) if st is not None else os.path.isdir(path)
+        if is_dir:
             if self.showing_file_info:
                 self.showing_file_info = False
                 self.remove_info_overlay()
                 self.create_new_series()
             self.start_folder_size_worker(path)
         else:
+            # Результаты подсчёта папки больше не нужны: новый id отсекает
+            # сигналы, которые воркер успел отправить до прерывания
+            self.current_worker_id += 1
+            self._cancel_size_worker()
+            self.progress_bar.setVisible(False)
             self.showing_file_info = True
             self.remove_info_overlay()
             self.show_file_properties(path)
 
     def show_file_properties(self, path):
-        t = self.texts[self.lang]
-        try:
-            stat = os.stat(path)
-        except Exception:
-            self.chart_widget.clear_chart()
-            return
+        t = self.t
+        st = self.tree.get_cached_stat(path)
+        if st is None:
+            try:
+                st = os.stat(path)
+            except Exception:
+                self.chart_widget.clear_chart()
+                return
         locale = QLocale.system()
-        mtime = QDateTime.fromSecsSinceEpoch(int(stat.st_mtime))
-        atime = QDateTime.fromSecsSinceEpoch(int(stat.st_atime))
-        ctime = QDateTime.fromSecsSinceEpoch(int(stat.st_ctime))
+        mtime = QDateTime.fromSecsSinceEpoch(int(st.st_mtime))
+        atime = QDateTime.fromSecsSinceEpoch(int(st.st_atime))
+        ctime = QDateTime.fromSecsSinceEpoch(int(st.st_ctime))
         props = [
             (t['props_path'], path),
-            (t['props_size'], human_readable_size(stat.st_size)),
+            (t['props_size'], human_readable_size(st.st_size)),
             (t['props_last_mod'], locale.toString(mtime, QLocale.LongFormat)),
             (t['props_last_acc'], locale.toString(atime, QLocale.LongFormat)),
             (t['props_created'], locale.toString(ctime, QLocale.LongFormat)),
-            (t['props_rights'], oct(stat.st_mode)[-3:]),
-            (t['props_is_dir'], t['props_yes'] if os.path.isdir(path) else t['props_no']),
-            (t['props_is_file'], t['props_yes'] if os.path.isfile(path) else t['props_no']),
+            (t['props_rights'], oct(st.st_mode)[-3:]),
+            (t['props_is_dir'], t['props_yes'] if stat.S_ISDIR(st.st_mode) else t['props_no']),
+            (t['props_is_file'], t['props_yes'] if stat.S_ISREG(st.st_mode) else t['props_no']),
         ]
         chart = self.chart_widget.chart
         chart.removeAllSeries()
+        # removeAllSeries удаляет C++-объект серии, ссылка на него больше недействительна
+        self.chart_widget.series = None
         chart.setTitle(t['file_props'].format(os.path.basename(path)))
         self.info_overlay = InfoOverlay(self.chart_widget.chart_view.viewport(), props)
         self.info_overlay.show()
@@ -693,48 +935,71 @@ class MainWindow(QMainWindow):
     def start_folder_size_worker(self, path):
         self.current_worker_id += 1
         worker_id = self.current_worker_id
-        self._cancel_previous_operations()
-        self.thread = QThread(self)
-        self.worker = FolderSizeWorker(path)
-        self.worker.moveToThread(self.thread)
-        self.thread.started.connect(self.worker.process)
-        self.worker.finished.connect(lambda data: self.on_worker_finished(data, worker_id))
-        self.worker.error.connect(self.on_worker_error)
-        self.worker.progress.connect(self.progress_bar.setValue)
-        self.worker.finished.connect(self.thread.quit)
-        self.worker.finished.connect(self.worker.deleteLater)
-        self.thread.finished.connect(self.thread.deleteLater)
-        self.thread.finished.connect(self.clear_thread_worker_refs)
-        self.thread.start()
-        logging.debug(f"Started FolderSizeWorker thread for {path}")
+        # Загрузки в дереве не трогаем: папка, раскрытая сразу после выбора,
+        # должна догрузиться, даже если подсчёт размеров стартует позже
+        self._cancel_size_worker()
+        cached = self._result_cache.get(path)
+        if cached is not None:
+            self._result_cache.move_to_end(path)
+            self.show_folder_sizes(path, cached, provisional=True)
+        self.worker = FolderSizeWorker(path, self._size_executor)
+        signals = self.worker.signals
+        signals.finished.connect(lambda data: self.on_worker_finished(data, worker_id))
+        # Предварительная диаграмма заменяется первыми же данными нового подсчёта
+        signals.partial.connect(lambda data: self.on_worker_partial(data, worker_id))
+        signals.error.connect(self.on_worker_error)
+        signals.progress.connect(self.progress_bar.setValue)
+        self.thread_pool.start(self.worker)
+        logging.debug("Started FolderSizeWorker for %s", path)
 
     def on_worker_finished(self, data, worker_id):
         if worker_id != self.current_worker_id:
             return
         self.progress_bar.setVisible(False)
         if self.worker and self.worker.path:
-            folder_name = os.path.basename(self.worker.path)
+            path = self.worker.path
+            self._result_cache[path] = data
+            self._result_cache.move_to_end(path)
+            while len(self._result_cache) > self._result_cache_limit:
+                self._result_cache.popitem(last=False)
+            self.show_folder_sizes(path, data)
+        self.clear_worker_refs()
+
+    def on_worker_partial(self, data, worker_id):
+        if worker_id != self.current_worker_id:
+            return
+        if self.worker and self.worker.path:
+            self.show_folder_sizes(self.worker.path, data)
+
+    def show_folder_sizes(self, path, data, provisional=False):
+        if self.chart_widget.series is None:
             self.create_new_series()
-            self.chart_widget.update_data(
-                data,
-                folder_name,
-                self.texts[self.lang]['empty_folder']
-            )
-        self.clear_thread_worker_refs()
+        folder_name = os.path.basename(path)
+        if provisional:
+            # Результат прошлого подсчёта помечается в заголовке
+            folder_name = self.t['cached_chart'].format(folder_name)
+        self.chart_widget.update_data(
+            data,
+            folder_name,
+            self.t['empty_folder'],
+            self.t['other']
+        )
 
     def on_worker_error(self, error_msg):
-        t = self.texts[self.lang]
+        t = self.t
         self.chart_widget.chart.setTitle(t['err_size'].format(error_msg))
         self.progress_bar.setVisible(False)
-        logging.error(f"FolderSizeWorker error: {error_msg}")
+        logging.error("FolderSizeWorker error: %s", error_msg)
 
-    def clear_thread_worker_refs(self):
-        self.thread = None
+    def clear_worker_refs(self):
         self.worker = None
 
     def closeEvent(self, event):
         self._cancel_previous_operations()
-        self.tree._cleanup_threads()
+        self.thread_pool.waitForDone()
+        self._size_executor.shutdown(cancel_futures=True)
+        self.tree._cleanup_loaders()
+        self.tree._loader_pool.waitForDone()
         event.accept()
 
 if __name__ == "__main__":